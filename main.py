@@ -23,40 +23,146 @@ Usage examples:
 
   # Disable console output (only save log)
   python main.py --quiet "Tell me a joke."
+
+  # Always call the APIs, even for cached temperature=0 models
+  python main.py --no-cache "What is 2+2?"
 """
 
 import argparse
+import asyncio
+import contextlib
+import hashlib
+import os
 import sys
 import uuid
-import concurrent.futures
+from collections import Counter
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
+import orjson
 import yaml
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
 
-from providers import GoogleCloudProvider, AWSBedrockProvider
 from providers.base import BaseProvider, LLMResponse
-from utils.logger import save_log, print_summary
+from providers.cache import CachedProvider, is_deterministic
+import utils.logger as logger_module
+from utils.logger import (
+    LogWriter,
+    print_responses,
+    print_summary_header,
+    print_summary_row,
+)
 
 
 DEFAULT_CONFIG = Path(__file__).parent / "config.yaml"
 
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+
+def _cache_dir() -> Path:
+    """Return the user-private directory holding parsed-file caches."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    path = Path(base) / "llm-evaluation"
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return path
+
+
+def _load_with_cache(path: Path, parse: Callable[[Path], Any]) -> Any:
+    """
+    Return parse(path), reusing a result cached in the user's cache directory.
+
+    The cache is keyed by the source file's mtime and size, so editing the
+    file invalidates it. It is stored as JSON (never pickle, so a planted
+    cache file cannot run code) in a private directory with mode 0600, and
+    only when the parsed data survives a JSON round trip unchanged. Cache
+    read/write failures fall back to parsing.
+    """
+    stat = path.stat()
+    key = [stat.st_mtime_ns, stat.st_size]
+    try:
+        cache_dir = _cache_dir()
+    except OSError:
+        return parse(path)
+    name = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()
+    cache_path = cache_dir / f"{name}.json"
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+        if cached["key"] == key:
+            return cached["data"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        pass
+
+    data = parse(path)
+    try:
+        blob = orjson.dumps({"key": key, "data": data})
+    except TypeError:
+        return data
+    # Types JSON can't represent faithfully (dates, sets, NaN, ...) are not cached
+    if orjson.loads(blob)["data"] != data:
+        return data
+
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+    return data
+
+
+def _parse_yaml(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def load_config(config_path: Path) -> dict:
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return _load_with_cache(config_path, _parse_yaml)
+
+
+def load_env() -> None:
+    """
+    Load .env into os.environ, overriding existing values.
+
+    Does nothing when there is no .env file; otherwise the parsed values are
+    cached (see _load_with_cache). Files using ${VAR} interpolation are
+    always re-parsed, since the expanded values depend on the environment.
+    """
+    dotenv_path = find_dotenv()
+    if not dotenv_path:
+        return
+    env_path = Path(dotenv_path)
+    if "${" in env_path.read_text(encoding="utf-8"):
+        values = dotenv_values(env_path)
+    else:
+        values = _load_with_cache(env_path, dotenv_values)
+    os.environ.update({k: v for k, v in values.items() if v is not None})
 
 
-def build_provider(key: str, model_cfg: dict) -> BaseProvider:
+def build_provider(
+    key: str, model_cfg: dict, bedrock_clients: Optional[dict] = None
+) -> BaseProvider:
     provider_type = model_cfg.get("provider", "").lower()
     model_id = model_cfg["model_id"]
-    extra = model_cfg.get("options", {})
+    # An empty "options:" key in YAML loads as None
+    extra = model_cfg.get("options") or {}
 
     if provider_type == "google_cloud":
+        from providers import GoogleCloudProvider
+
         return GoogleCloudProvider(model_id=model_id, config=extra)
     elif provider_type == "aws_bedrock":
-        return AWSBedrockProvider(model_id=model_id, config=extra)
+        from providers import AWSBedrockProvider
+
+        region = AWSBedrockProvider.resolve_region(extra)
+        client = (bedrock_clients or {}).get(region)
+        return AWSBedrockProvider(model_id=model_id, config=extra, client=client)
     else:
         raise ValueError(
             f"Unknown provider '{provider_type}' for model key '{key}'. "
@@ -64,12 +170,75 @@ def build_provider(key: str, model_cfg: dict) -> BaseProvider:
         )
 
 
+def build_bedrock_clients(selected: dict) -> dict:
+    """
+    Create one bedrock-runtime client per region used by the selected models.
+
+    Each client's connection pool is sized to the number of models that will
+    share it, so parallel runs in one region are never pool-bound.
+    """
+    bedrock_cfgs = [
+        cfg.get("options") or {}
+        for cfg in selected.values()
+        if cfg.get("provider", "").lower() == "aws_bedrock"
+    ]
+    if not bedrock_cfgs:
+        return {}
+
+    from providers.aws_bedrock import AWSBedrockProvider, create_client
+
+    regions = Counter(AWSBedrockProvider.resolve_region(opts) for opts in bedrock_cfgs)
+    return {
+        region: create_client(region, max_pool_connections=max(10, count))
+        for region, count in regions.items()
+    }
+
+
 def run_model(key: str, provider: BaseProvider, prompt: str) -> LLMResponse:
-    return provider.run(prompt)
+    # One model failing unexpectedly must not abort the comparison
+    try:
+        return provider.run(prompt)
+    except Exception as e:
+        return provider.error_response(prompt, e)
+
+
+async def _arun_model(provider: BaseProvider, prompt: str) -> LLMResponse:
+    try:
+        return await provider.arun(prompt)
+    except Exception as e:
+        return provider.error_response(prompt, e)
+
+
+async def run_models_async(
+    providers: dict[str, BaseProvider],
+    prompt: str,
+    on_result: Optional[Callable[[LLMResponse], None]] = None,
+) -> List[LLMResponse]:
+    """
+    Run all providers concurrently on a single event loop.
+
+    Results are collected in completion order; on_result (if given) is called
+    for each response as soon as its model finishes. A model whose call
+    raises is reported as an error response instead of stopping the others.
+    """
+    responses: List[LLMResponse] = []
+    # Provider sessions hold loop-bound resources; close them with the run
+    async with contextlib.AsyncExitStack() as stack:
+        for prov in providers.values():
+            await stack.enter_async_context(prov.session())
+        tasks = [
+            asyncio.ensure_future(_arun_model(prov, prompt)) for prov in providers.values()
+        ]
+        for next_done in asyncio.as_completed(tasks):
+            resp = await next_done
+            if on_result:
+                on_result(resp)
+            responses.append(resp)
+    return responses
 
 
 def main() -> int:
-    load_dotenv(override=True)
+    load_env()
 
     parser = argparse.ArgumentParser(
         description="Compare LLM responses across multiple cloud providers.",
@@ -116,6 +285,25 @@ def main() -> int:
         action="store_true",
         help="Suppress console output; only write the log file.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the response cache used for temperature=0 models.",
+    )
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help=(
+            "Also reuse cached responses for near-duplicate prompts "
+            "(embedding similarity; requires numpy and Google credentials)."
+        ),
+    )
+    parser.add_argument(
+        "--semantic-threshold",
+        type=float,
+        default=0.92,
+        help="Cosine similarity above which a cached response is reused (default: 0.92).",
+    )
     parser.add_argument(
         "--log-dir",
         metavar="PATH",
@@ -149,7 +337,6 @@ def main() -> int:
 
     # Override log dir if specified
     if args.log_dir:
-        import utils.logger as logger_module
         logger_module.LOG_DIR = args.log_dir
 
     # --- Select models ---
@@ -175,13 +362,42 @@ def main() -> int:
 
     # --- Build providers ---
     providers: dict[str, BaseProvider] = {}
+    try:
+        bedrock_clients = build_bedrock_clients(selected)
+    except Exception as e:
+        print(f"Failed to initialize AWS Bedrock client: {e}", file=sys.stderr)
+        return 1
+
+    cache_dir = logger_module.LOG_DIR / "cache"
+    embedder = None
+    if args.semantic_cache and not args.no_cache:
+        try:
+            from providers import GeminiEmbedder
+            embedder = GeminiEmbedder()
+        except Exception as e:
+            print(f"Failed to initialize semantic cache: {e}", file=sys.stderr)
+            return 1
     for key, cfg in selected.items():
         try:
-            providers[key] = build_provider(key, cfg)
+            providers[key] = build_provider(key, cfg, bedrock_clients)
         except Exception as e:
             print(f"Failed to initialize model '{key}': {e}", file=sys.stderr)
             return 1
 
+        # Deterministic (temperature=0) answers are served from the response cache
+        if not args.no_cache and is_deterministic(cfg.get("options") or {}):
+            try:
+                providers[key] = CachedProvider(
+                    providers[key],
+                    cfg,
+                    cache_dir,
+                    embedder=embedder,
+                    semantic_threshold=args.semantic_threshold,
+                )
+            except ImportError as e:
+                print(f"Failed to initialize semantic cache: {e}", file=sys.stderr)
+                return 1
+
     if not args.quiet:
         print(f"Prompt: {prompt[:120]}{'...' if len(prompt) > 120 else ''}")
         print(f"Running {len(providers)} model(s)...\n")
@@ -189,34 +405,42 @@ def main() -> int:
     # --- Execute ---
     run_id = str(uuid.uuid4())
     responses: List[LLMResponse] = []
+    has_error = False
 
     use_parallel = not args.sequential
 
-    if use_parallel:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(providers)) as executor:
-            futures = {
-                executor.submit(run_model, key, prov, prompt): key
-                for key, prov in providers.items()
-            }
-            for future in concurrent.futures.as_completed(futures):
-                responses.append(future.result())
-    else:
-        for key, prov in providers.items():
-            responses.append(run_model(key, prov, prompt))
-
-    # Sort by model name for consistent output
-    responses.sort(key=lambda r: r.model)
-
-    # --- Output ---
     if not args.quiet:
-        print_summary(responses)
+        print_summary_header()
+
+    # Each result is logged and printed as soon as its model finishes, so the
+    # disk/stdout I/O overlaps with the requests still in flight
+    with LogWriter(run_id, prompt) as log:
+
+        def on_result(resp: LLMResponse) -> None:
+            nonlocal has_error
+            has_error |= bool(resp.error)
+            log.write(resp)
+            if not args.quiet:
+                print_summary_row(resp)
+
+        if use_parallel:
+            responses = asyncio.run(run_models_async(providers, prompt, on_result))
+        else:
+            for key, prov in providers.items():
+                resp = run_model(key, prov, prompt)
+                on_result(resp)
+                responses.append(resp)
 
-    log_path = save_log(responses, run_id)
+    # --- Output ---
     if not args.quiet:
-        print(f"Log saved: {log_path}")
+        # Sort by model name for consistent output
+        if len(responses) > 1:
+            responses.sort(key=attrgetter("model"))
+        print_responses(responses)
+        print(f"Log saved: {log.path}")
 
     # Return non-zero if any model errored
-    return 1 if any(r.error for r in responses) else 0
+    return 1 if has_error else 0
 
 
 if __name__ == "__main__":
@@ -1,5 +1,34 @@
+from importlib import import_module
+
 from .base import BaseProvider, LLMResponse
-from .google_cloud import GoogleCloudProvider
-from .aws_bedrock import AWSBedrockProvider
+from .cache import CachedProvider
+
+# Provider classes are imported on first access (PEP 562) so that only the
+# SDKs for the providers actually in use get loaded.
+_LAZY_PROVIDERS = {
+    "GoogleCloudProvider": ".google_cloud",
+    "GeminiEmbedder": ".google_cloud",
+    "AWSBedrockProvider": ".aws_bedrock",
+}
+
+__all__ = [
+    "BaseProvider",
+    "LLMResponse",
+    "CachedProvider",
+    "GoogleCloudProvider",
+    "GeminiEmbedder",
+    "AWSBedrockProvider",
+]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_PROVIDERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["BaseProvider", "LLMResponse", "GoogleCloudProvider", "AWSBedrockProvider"]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_PROVIDERS))
@@ -1,11 +1,95 @@
-import json
+import io
+import re
 import time
 import os
-from typing import Optional
+from typing import Any, Optional
+
+import boto3
+import orjson
+import urllib3.exceptions
+from botocore.config import Config
+from botocore.eventstream import ParserError
+from botocore.exceptions import BotoCoreError, ClientError
 
 from .base import BaseProvider, LLMResponse
 
 
+# One bedrock-runtime client per region, shared by every provider instance.
+# botocore clients are thread-safe, and building one (session setup, service
+# model loading, endpoint resolution) is the expensive part of __init__.
+_CLIENT_CACHE: dict[str, Any] = {}
+
+
+# Failures reported as a per-model error response instead of raising.
+# ClientError also covers error events (EventStreamError) inside a stream;
+# a dropped or timed-out stream raises urllib3 errors while iterating, and
+# a corrupt frame raises ParserError.
+_API_ERRORS = (BotoCoreError, ClientError, ParserError, urllib3.exceptions.HTTPError, OSError)
+
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def _count_new_words(fragment: str, in_word: bool) -> int:
+    """
+    Count whitespace-separated words in a streamed text fragment.
+
+    in_word tells whether the previous fragment ended mid-word, in which case
+    a word continuing at the start of this fragment is not counted twice.
+    """
+    count = sum(1 for _ in _WORD_RE.finditer(fragment))
+    if count and in_word and not fragment[0].isspace():
+        count -= 1
+    return count
+
+
+def _join_blocks(blocks: dict, tool_block_type: str) -> str:
+    """Join streamed text and json_output tool blocks in index order, one per line."""
+    buf = io.StringIO()
+    for _, (block_type, name, block_buf) in sorted(blocks.items()):
+        if block_type == "text":
+            buf.write(block_buf.getvalue())
+        elif block_type == tool_block_type and name == "json_output":
+            # The streamed tool input fragments already form the JSON text
+            buf.write(block_buf.getvalue() or "{}")
+        else:
+            continue
+        buf.write("\n")
+    return buf.getvalue()[:-1]
+
+
+def create_client(region: str, max_pool_connections: int = 32) -> Any:
+    """
+    Create a bedrock-runtime client for region.
+
+    A client can be shared by any number of AWSBedrockProvider instances in
+    the same region; size max_pool_connections to how many of them may run
+    concurrently.
+    """
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=region,
+        config=Config(
+            max_pool_connections=max_pool_connections,
+            # Standard mode retries throttling and transient 5xx errors with
+            # exponential backoff and jitter
+            retries={"max_attempts": 3, "mode": "standard"},
+            # Send TCP keep-alive probes on idle pooled sockets so a peer that
+            # silently went away is eventually detected (connection reuse
+            # itself is handled by urllib3's pool)
+            tcp_keepalive=True,
+        ),
+    )
+
+
+def _get_client(region: str) -> Any:
+    client = _CLIENT_CACHE.get(region)
+    if client is None:
+        # The default pool of 10 would cap the shared provider thread pool
+        client = _CLIENT_CACHE.setdefault(region, create_client(region, 32))
+    return client
+
+
 class AWSBedrockProvider(BaseProvider):
     """
     AWS Bedrock provider for Claude and Amazon Nova models.
@@ -25,46 +109,62 @@ class AWSBedrockProvider(BaseProvider):
         temperature (float): Sampling temperature
         max_tokens (int): Max output tokens (default: 4096)
         region (str): AWS region override
+
+    A pre-built client (see create_client) can be passed to share one
+    connection pool between providers; otherwise a per-region cached client
+    is used.
     """
 
+    provider_name = "aws_bedrock"
+
     # Model families that use the Anthropic Messages API on Bedrock
     ANTHROPIC_PREFIXES = ("anthropic.", "jp.anthropic.", "us.anthropic.", "eu.anthropic.", "ap.anthropic.")
-    # Model families that use the Amazon Converse / Nova API
-    AMAZON_PREFIXES = ("amazon.", "jp.amazon.", "us.amazon.", "eu.amazon.", "ap.amazon.")
 
     # Claude models that support native structured output via output_config.format
-    NATIVE_STRUCTURED_OUTPUT_PATTERNS = (
+    NATIVE_STRUCTURED_OUTPUT_PATTERNS = frozenset({
         "claude-haiku-4-5",
         "claude-sonnet-4-5",
         "claude-opus-4-5",
         "claude-opus-4-6",
         "claude-sonnet-4-6",
-    )
-
-    def __init__(self, model_id: str, config: Optional[dict] = None):
-        import boto3
+    })
+    # Extracts the "claude-<tier>-<major>-<minor>" family from a model id
+    _CLAUDE_FAMILY_RE = re.compile(r"claude-[a-z]+-\d+-\d{1,2}(?!\d)")
 
+    def __init__(
+        self, model_id: str, config: Optional[dict] = None, client: Any = None
+    ):
         self.model_id = model_id
         self.config = config or {}
 
-        region = self.config.get("region") or os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
+        self.client = client or _get_client(self.resolve_region(self.config))
 
-        self.client = boto3.client(
-            "bedrock-runtime",
-            region_name=region,
-        )
+        # Requests only vary by prompt, so resolve all static config once
+        self._response_format = self.config.get("response_format")
 
-    def _is_anthropic_model(self) -> bool:
-        return any(self.model_id.startswith(p) for p in self.ANTHROPIC_PREFIXES)
+        # model_id never changes, so pick the API once instead of on every run()
+        if self._is_anthropic_model():
+            self._anthropic_body_tmpl = self._build_anthropic_body()
+            self._invoke = self._run_anthropic
+        else:
+            # Amazon Nova models use the Converse API, which is also the
+            # fallback for any other model family
+            self._converse_kwargs_tmpl = self._build_converse_kwargs()
+            self._invoke = self._run_amazon_converse
+
+    @staticmethod
+    def resolve_region(config: dict) -> str:
+        return config.get("region") or os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
 
-    def _is_amazon_model(self) -> bool:
-        return any(self.model_id.startswith(p) for p in self.AMAZON_PREFIXES)
+    def _is_anthropic_model(self) -> bool:
+        return self.model_id.startswith(self.ANTHROPIC_PREFIXES)
 
     def _supports_native_structured_output(self) -> bool:
-        return any(p in self.model_id for p in self.NATIVE_STRUCTURED_OUTPUT_PATTERNS)
+        match = self._CLAUDE_FAMILY_RE.search(self.model_id)
+        return match is not None and match.group() in self.NATIVE_STRUCTURED_OUTPUT_PATTERNS
 
-    def _run_anthropic(self, prompt: str) -> LLMResponse:
-        """Invoke a Claude model via the Anthropic Messages API on Bedrock."""
+    def _build_anthropic_body(self) -> dict:
+        """Build the prompt-independent part of the Anthropic Messages request body."""
         enable_thinking = self.config.get("enable_thinking", False)
         thinking_budget = self.config.get("thinking_budget", 2000)
         max_tokens = self.config.get("max_tokens", 4096)
@@ -73,7 +173,6 @@ class AWSBedrockProvider(BaseProvider):
 
         request_body: dict = {
             "anthropic_version": "bedrock-2023-05-31",
-            "messages": [{"role": "user", "content": prompt}],
             "max_tokens": max_tokens,
         }
 
@@ -113,33 +212,76 @@ class AWSBedrockProvider(BaseProvider):
             }]
             request_body["tool_choice"] = {"type": "tool", "name": "json_output"}
 
+        return request_body
+
+    def _run_anthropic(self, prompt: str) -> LLMResponse:
+        """Invoke a Claude model via the Anthropic Messages API on Bedrock."""
+        response_format = self._response_format
+        request_body = self._anthropic_body_tmpl | {
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
         try:
-            start = time.time()
-            raw = self.client.invoke_model(
+            start = time.perf_counter_ns()
+            raw = self.client.invoke_model_with_response_stream(
                 modelId=self.model_id,
-                body=json.dumps(request_body),
+                body=orjson.dumps(request_body),
                 contentType="application/json",
                 accept="application/json",
             )
-            latency_ms = (time.time() - start) * 1000
 
-            body = json.loads(raw["body"].read())
-            usage = body.get("usage", {})
-            input_tokens = usage.get("input_tokens", 0)
-            output_tokens = usage.get("output_tokens", 0)
-
-            # Thinking tokens: sum of tokens in thinking blocks
+            first_token_ms: Optional[float] = None
+            usage: dict = {}
+            # Thinking tokens: words in thinking blocks, counted as deltas stream in
             thinking_tokens: Optional[int] = None
-            response_text_parts = []
-            for block in body.get("content", []):
-                if block.get("type") == "thinking":
-                    thinking_tokens = (thinking_tokens or 0) + len(
-                        block.get("thinking", "").split()
+            thinking_in_word = False
+            # content block index -> (block type, tool name, streamed text buffer)
+            blocks: dict = {}
+            for event in raw["body"]:
+                if "chunk" not in event:
+                    continue
+                chunk = orjson.loads(event["chunk"]["bytes"])
+                chunk_type = chunk.get("type")
+                if chunk_type == "message_start":
+                    usage = chunk["message"].get("usage", {})
+                elif chunk_type == "content_block_start":
+                    block = chunk["content_block"]
+                    if block.get("type") == "thinking":
+                        thinking_tokens = thinking_tokens or 0
+                        thinking_in_word = False
+                    blocks[chunk["index"]] = (
+                        block.get("type"), block.get("name"), io.StringIO()
                     )
-                elif block.get("type") == "text":
-                    response_text_parts.append(block.get("text", ""))
-                elif block.get("type") == "tool_use" and block.get("name") == "json_output":
-                    response_text_parts.append(json.dumps(block["input"], ensure_ascii=False))
+                elif chunk_type == "content_block_delta":
+                    delta = chunk["delta"]
+                    delta_type = delta.get("type")
+                    if delta_type == "thinking_delta":
+                        fragment = delta.get("thinking", "")
+                        thinking_tokens = (thinking_tokens or 0) + _count_new_words(
+                            fragment, thinking_in_word
+                        )
+                        if fragment:
+                            thinking_in_word = not fragment[-1].isspace()
+                        continue
+                    elif delta_type == "text_delta":
+                        fragment = delta.get("text", "")
+                    elif delta_type == "input_json_delta":
+                        fragment = delta.get("partial_json", "")
+                    else:
+                        continue
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter_ns() - start) / 1_000_000
+                    blocks[chunk["index"]][2].write(fragment)
+                elif chunk_type == "message_delta":
+                    usage = usage | chunk.get("usage", {})
+            latency_ms = (time.perf_counter_ns() - start) / 1_000_000
+
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+            # Prefer an exact thinking count over the word estimate if Bedrock reports one
+            reported_thinking = usage.get("thinking_tokens") or usage.get("reasoning_tokens")
+            if reported_thinking is not None:
+                thinking_tokens = reported_thinking
 
             # If extended thinking is on, Bedrock may report cache_read/creation tokens too
             raw_usage = {
@@ -153,31 +295,21 @@ class AWSBedrockProvider(BaseProvider):
                 model=self.model_id,
                 provider="aws_bedrock",
                 prompt=prompt,
-                response="\n".join(response_text_parts),
+                response=_join_blocks(blocks, "tool_use"),
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 thinking_tokens=thinking_tokens,
                 latency_ms=latency_ms,
                 raw_usage=raw_usage,
                 response_format=response_format,
+                first_token_ms=first_token_ms,
             )
 
-        except Exception as e:
-            return LLMResponse(
-                model=self.model_id,
-                provider="aws_bedrock",
-                prompt=prompt,
-                response="",
-                input_tokens=0,
-                output_tokens=0,
-                thinking_tokens=None,
-                latency_ms=0.0,
-                error=str(e),
-                response_format=response_format,
-            )
+        except _API_ERRORS as e:
+            return self.error_response(prompt, e)
 
-    def _run_amazon_converse(self, prompt: str) -> LLMResponse:
-        """Invoke an Amazon Nova model via the Converse API."""
+    def _build_converse_kwargs(self) -> dict:
+        """Build the prompt-independent Converse API arguments."""
         max_tokens = self.config.get("max_tokens", 4096)
         response_format = self.config.get("response_format")
         response_schema = self.config.get("response_schema")
@@ -188,7 +320,6 @@ class AWSBedrockProvider(BaseProvider):
 
         converse_kwargs: dict = {
             "modelId": self.model_id,
-            "messages": [{"role": "user", "content": [{"text": prompt}]}],
             "inferenceConfig": inference_config,
         }
         if response_format == "json":
@@ -204,12 +335,52 @@ class AWSBedrockProvider(BaseProvider):
                 "toolChoice": {"tool": {"name": "json_output"}},
             }
 
+        return converse_kwargs
+
+    def _run_amazon_converse(self, prompt: str) -> LLMResponse:
+        """Invoke an Amazon Nova model via the Converse API."""
+        response_format = self._response_format
+        converse_kwargs = self._converse_kwargs_tmpl | {
+            "messages": [{"role": "user", "content": [{"text": prompt}]}],
+        }
+
         try:
-            start = time.time()
-            response = self.client.converse(**converse_kwargs)
-            latency_ms = (time.time() - start) * 1000
+            start = time.perf_counter_ns()
+            response = self.client.converse_stream(**converse_kwargs)
+
+            first_token_ms: Optional[float] = None
+            usage: dict = {}
+            # content block index -> (block type, tool name, streamed text buffer)
+            blocks: dict = {}
+            for event in response["stream"]:
+                if "contentBlockStart" in event:
+                    block_start = event["contentBlockStart"]
+                    tool_use = block_start.get("start", {}).get("toolUse")
+                    if tool_use:
+                        blocks[block_start["contentBlockIndex"]] = (
+                            "toolUse", tool_use.get("name"), io.StringIO()
+                        )
+                elif "contentBlockDelta" in event:
+                    block_delta = event["contentBlockDelta"]
+                    delta = block_delta["delta"]
+                    if "text" in delta:
+                        block_type, fragment = "text", delta["text"]
+                    elif "toolUse" in delta:
+                        block_type, fragment = "toolUse", delta["toolUse"].get("input", "")
+                    else:
+                        continue
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter_ns() - start) / 1_000_000
+                    block = blocks.get(block_delta["contentBlockIndex"])
+                    if block is None:
+                        block = blocks[block_delta["contentBlockIndex"]] = (
+                            block_type, None, io.StringIO()
+                        )
+                    block[2].write(fragment)
+                elif "metadata" in event:
+                    usage = event["metadata"].get("usage", {})
+            latency_ms = (time.perf_counter_ns() - start) / 1_000_000
 
-            usage = response.get("usage", {})
             input_tokens = usage.get("inputTokens", 0)
             output_tokens = usage.get("outputTokens", 0)
 
@@ -218,14 +389,6 @@ class AWSBedrockProvider(BaseProvider):
                 "reasoningTokens"
             )
 
-            output_message = response.get("output", {}).get("message", {})
-            content_parts = []
-            for block in output_message.get("content", []):
-                if "text" in block:
-                    content_parts.append(block["text"])
-                elif "toolUse" in block and block["toolUse"].get("name") == "json_output":
-                    content_parts.append(json.dumps(block["toolUse"]["input"], ensure_ascii=False))
-
             raw_usage = {
                 "inputTokens": input_tokens,
                 "outputTokens": output_tokens,
@@ -236,34 +399,18 @@ class AWSBedrockProvider(BaseProvider):
                 model=self.model_id,
                 provider="aws_bedrock",
                 prompt=prompt,
-                response="\n".join(content_parts),
+                response=_join_blocks(blocks, "toolUse"),
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 thinking_tokens=thinking_tokens,
                 latency_ms=latency_ms,
                 raw_usage=raw_usage,
                 response_format=response_format,
+                first_token_ms=first_token_ms,
             )
 
-        except Exception as e:
-            return LLMResponse(
-                model=self.model_id,
-                provider="aws_bedrock",
-                prompt=prompt,
-                response="",
-                input_tokens=0,
-                output_tokens=0,
-                thinking_tokens=None,
-                latency_ms=0.0,
-                error=str(e),
-                response_format=response_format,
-            )
+        except _API_ERRORS as e:
+            return self.error_response(prompt, e)
 
     def run(self, prompt: str) -> LLMResponse:
-        if self._is_anthropic_model():
-            return self._run_anthropic(prompt)
-        elif self._is_amazon_model():
-            return self._run_amazon_converse(prompt)
-        else:
-            # Fall back to Converse API for unknown model families
-            return self._run_amazon_converse(prompt)
+        return self._invoke(prompt)
@@ -1,9 +1,20 @@
+import asyncio
+import concurrent.futures
+import contextlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import AsyncContextManager, List, Optional
 
 
-@dataclass
+# Shared pool for providers whose SDK has no native async client. Kept at
+# module scope so repeated runs in one process (tests, servers) reuse it
+# instead of asyncio creating a fresh default executor per event loop.
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=32, thread_name_prefix="provider"
+)
+
+
+@dataclass(slots=True, frozen=True)
 class LLMResponse:
     model: str
     provider: str
@@ -16,9 +27,88 @@ class LLMResponse:
     error: Optional[str] = None
     raw_usage: dict = field(default_factory=dict)
     response_format: Optional[str] = None
+    # Time from sending the request until the first chunk of response text arrived
+    first_token_ms: Optional[float] = None
 
 
 class BaseProvider(ABC):
+    # Reported as LLMResponse.provider
+    provider_name: str = ""
+
     @abstractmethod
     def run(self, prompt: str) -> LLMResponse:
         pass
+
+    def error_response(self, prompt: str, error: Exception) -> LLMResponse:
+        """
+        Build the result reported for a call that raised instead of returning.
+
+        Lets callers running several models together report an unexpected
+        exception as that model's error row rather than aborting the others.
+        Providers also use it for the API errors they catch themselves, so
+        every error row has the same shape.
+        """
+        return LLMResponse(
+            model=getattr(self, "model_id", type(self).__name__),
+            provider=self.provider_name,
+            prompt=prompt,
+            response="",
+            input_tokens=0,
+            output_tokens=0,
+            thinking_tokens=None,
+            latency_ms=0.0,
+            error=str(error) or type(error).__name__,
+            response_format=getattr(self, "config", {}).get("response_format"),
+        )
+
+    def session(self) -> AsyncContextManager[None]:
+        """
+        Async context manager scoping a group of arun() calls on one event loop.
+
+        Providers holding loop-bound resources (e.g. async HTTP connection
+        pools) open them on entry and close them on exit, so nothing outlives
+        the loop. The default does nothing.
+        """
+        return contextlib.nullcontext()
+
+    async def arun(self, prompt: str) -> LLMResponse:
+        """
+        Async variant of run().
+
+        Providers without a native async client fall back to running the
+        blocking call in a worker thread so it can still be awaited.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_EXECUTOR, self.run, prompt)
+
+    async def arun_batch(
+        self, prompts: List[str], max_concurrency: int = 8
+    ) -> List[LLMResponse]:
+        """
+        Run many prompts concurrently, at most max_concurrency at a time.
+
+        Results are returned in the same order as prompts. A prompt whose
+        call raises yields an error_response() rather than failing the batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(prompt: str) -> LLMResponse:
+            async with semaphore:
+                try:
+                    return await self.arun(prompt)
+                except Exception as e:
+                    return self.error_response(prompt, e)
+
+        async with self.session():
+            return list(await asyncio.gather(*(run_one(p) for p in prompts)))
+
+    def run_batch(
+        self, prompts: List[str], max_concurrency: int = 8
+    ) -> List[LLMResponse]:
+        """
+        Blocking wrapper around arun_batch() for callers outside an event loop.
+
+        Each call runs on a fresh event loop; loop-bound resources are scoped
+        to it through session().
+        """
+        return asyncio.run(self.arun_batch(prompts, max_concurrency))
@@ -0,0 +1,243 @@
+import contextlib
+import hashlib
+import json
+import os
+import warnings
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from .base import BaseProvider, LLMResponse
+
+
+# Set once the first embedding failure has been reported, so a broken
+# semantic cache warns once per process instead of once per call
+_embed_failure_reported = False
+
+
+def _report_embed_failure(e: Exception) -> None:
+    global _embed_failure_reported
+    if not _embed_failure_reported:
+        _embed_failure_reported = True
+        warnings.warn(
+            f"Semantic cache lookup skipped, embedding failed: {e}",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+
+def is_deterministic(options: dict) -> bool:
+    """
+    Return True if a model configured with these options answers deterministically.
+
+    Only temperature=0 qualifies; an unset temperature means the provider's
+    (non-zero) default. Claude extended thinking forces temperature=1.
+    """
+    return options.get("temperature") == 0 and not options.get("enable_thinking", False)
+
+
+class SemanticIndex:
+    """
+    Prompt-embedding index for one model definition, stored as an .npz file.
+
+    Maps unit-normalised prompt embeddings to the exact-cache digests of the
+    responses they produced. Requires numpy.
+    """
+
+    def __init__(self, path: Path):
+        import numpy as np
+
+        self._np = np
+        self._path = path
+        try:
+            with np.load(path) as data:
+                self._vectors = data["vectors"]
+                self._keys = data["keys"].tolist()
+        except (OSError, ValueError, KeyError):
+            self._vectors = np.empty((0, 0), dtype=np.float32)
+            self._keys = []
+
+    def _normalise(self, vector):
+        v = self._np.asarray(vector, dtype=self._np.float32)
+        norm = self._np.linalg.norm(v)
+        return v / norm if norm else v
+
+    def search(self, vector) -> tuple[Optional[str], float]:
+        """Return (key, cosine similarity) of the nearest stored prompt."""
+        v = self._normalise(vector)
+        if not self._keys or self._vectors.shape[1] != v.shape[0]:
+            return None, 0.0
+        sims = self._vectors @ v
+        i = int(sims.argmax())
+        return self._keys[i], float(sims[i])
+
+    def add(self, key: str, vector) -> None:
+        v = self._normalise(vector)
+        if self._keys and self._vectors.shape[1] == v.shape[0]:
+            self._vectors = self._np.vstack([self._vectors, v])
+            self._keys.append(key)
+        else:
+            # First entry, or the embedding model changed dimensions
+            self._vectors = v[None, :]
+            self._keys = [key]
+
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                self._np.savez(f, vectors=self._vectors, keys=self._np.array(self._keys))
+            os.replace(tmp_path, self._path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+
+class CachedProvider(BaseProvider):
+    """
+    Exact-match on-disk response cache around another provider.
+
+    Responses are stored as JSON under cache_dir, keyed by a SHA-256 of the
+    model definition (provider, model_id, options) and the prompt. Errors are
+    never cached. A cache hit returns the stored response unchanged except
+    for raw_usage["cache"] = "exact"; latency and token counts are those of
+    the original call.
+
+    Only wrap providers whose options pass is_deterministic().
+
+    With an embedder (e.g. GeminiEmbedder), misses fall back to a semantic
+    lookup: if a previously answered prompt for the same model has an
+    embedding with cosine similarity above semantic_threshold, its response
+    is returned with raw_usage["cache"] = "semantic" and the similarity.
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        model_cfg: dict,
+        cache_dir: Path,
+        embedder: Any = None,
+        semantic_threshold: float = 0.92,
+    ):
+        self._provider = provider
+        self._cache_dir = cache_dir
+        self._model_key = {
+            "provider": model_cfg.get("provider"),
+            "model_id": model_cfg.get("model_id"),
+            "options": model_cfg.get("options") or {},
+        }
+        self._embedder = embedder
+        self._semantic_threshold = semantic_threshold
+        self._index: Optional[SemanticIndex] = None
+        if embedder is not None:
+            model_digest = self._digest({"model": self._model_key})
+            self._index = SemanticIndex(cache_dir / "semantic" / f"{model_digest}.npz")
+
+    @staticmethod
+    def _digest(payload: dict) -> str:
+        data = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def error_response(self, prompt: str, error: Exception) -> LLMResponse:
+        return self._provider.error_response(prompt, error)
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        async with contextlib.AsyncExitStack() as stack:
+            await stack.enter_async_context(self._provider.session())
+            embedder_session = getattr(self._embedder, "session", None)
+            if embedder_session is not None:
+                await stack.enter_async_context(embedder_session())
+            yield
+
+    def _cache_path(self, prompt: str) -> Path:
+        digest = self._digest({"model": self._model_key, "prompt": prompt})
+        return self._cache_dir / f"{digest}.json"
+
+    def _load(self, path: Path) -> Optional[LLMResponse]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return LLMResponse(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _lookup(self, path: Path) -> Optional[LLMResponse]:
+        resp = self._load(path)
+        if resp is None:
+            return None
+        return replace(resp, raw_usage={**resp.raw_usage, "cache": "exact"})
+
+    def _semantic_lookup(self, prompt: str, vector) -> Optional[LLMResponse]:
+        key, similarity = self._index.search(vector)
+        if key is None or similarity <= self._semantic_threshold:
+            return None
+        resp = self._load(self._cache_dir / f"{key}.json")
+        if resp is None:
+            return None
+        return replace(
+            resp,
+            prompt=prompt,
+            raw_usage={
+                **resp.raw_usage,
+                "cache": "semantic",
+                "similarity": round(similarity, 4),
+                "cached_prompt": resp.prompt,
+            },
+        )
+
+    def _store(self, path: Path, resp: LLMResponse) -> bool:
+        if resp.error:
+            return False
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(
+                json.dumps(asdict(resp), ensure_ascii=False), encoding="utf-8"
+            )
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _finish(self, path: Path, resp: LLMResponse, vector) -> LLMResponse:
+        if self._store(path, resp) and vector is not None:
+            self._index.add(path.stem, vector)
+        return resp
+
+    def run(self, prompt: str) -> LLMResponse:
+        path = self._cache_path(prompt)
+        cached = self._lookup(path)
+        if cached is not None:
+            return cached
+
+        vector = None
+        if self._index is not None:
+            try:
+                vector = self._embedder.embed(prompt)
+            except Exception as e:
+                # The semantic cache is best-effort; fall through to the API
+                _report_embed_failure(e)
+            else:
+                cached = self._semantic_lookup(prompt, vector)
+                if cached is not None:
+                    return cached
+
+        return self._finish(path, self._provider.run(prompt), vector)
+
+    async def arun(self, prompt: str) -> LLMResponse:
+        path = self._cache_path(prompt)
+        cached = self._lookup(path)
+        if cached is not None:
+            return cached
+
+        vector = None
+        if self._index is not None:
+            try:
+                vector = await self._embedder.aembed(prompt)
+            except Exception as e:
+                _report_embed_failure(e)
+            else:
+                cached = self._semantic_lookup(prompt, vector)
+                if cached is not None:
+                    return cached
+
+        return self._finish(path, await self._provider.arun(prompt), vector)
@@ -1,10 +1,223 @@
+import asyncio
 import time
 import os
-from typing import Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import AsyncContextManager, AsyncIterator, Optional
+
+import httpx
+from google import genai
+from google.auth.exceptions import GoogleAuthError
+from google.genai import errors, types
+from google.genai.client import AsyncClient
+from pydantic import ValidationError
 
 from .base import BaseProvider, LLMResponse
 
 
+@lru_cache(maxsize=None)
+def _thinking_config(thinking_budget: int) -> types.ThinkingConfig:
+    # Shared across providers with the same budget; the config is never mutated
+    return types.ThinkingConfig(thinking_budget=thinking_budget)
+
+
+# Stand-in when a stream ends without reporting usage; every count is None
+_EMPTY_USAGE = types.GenerateContentResponseUsageMetadata()
+
+
+# Connection pool limits for the httpx clients behind genai.Client. Keeping
+# idle connections alive longer than httpx's 5s default lets back-to-back
+# prompts reuse warm connections instead of re-handshaking.
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0,
+)
+
+
+# Retry transient failures (408/429/5xx and httpx connection errors) with
+# exponential backoff and jitter, using the SDK's own retry support. Any
+# other error is returned to the caller on the first failure.
+_RETRY_OPTIONS = types.HttpRetryOptions(
+    attempts=3,
+    initial_delay=1.0,
+    max_delay=8.0,
+    http_status_codes=[408, 429, 500, 502, 503, 504],
+)
+
+# Failures reported as a per-model error response instead of raising:
+# API errors, transport/stream errors from httpx (or aiohttp, which the SDK
+# uses for async calls when installed), malformed responses that fail SDK
+# model validation, auth failures and OS-level socket errors/timeouts
+_API_ERRORS: tuple = (
+    errors.APIError,
+    httpx.HTTPError,
+    ValidationError,
+    GoogleAuthError,
+    OSError,
+)
+try:
+    import aiohttp
+except ImportError:
+    pass
+else:
+    _API_ERRORS += (aiohttp.ClientError,)
+
+
+def _new_genai_client(
+    api_key: Optional[str], project: Optional[str], location: Optional[str]
+) -> genai.Client:
+    http_options = types.HttpOptions(
+        client_args={"limits": _HTTP_LIMITS},
+        async_client_args={"limits": _HTTP_LIMITS},
+        retry_options=_RETRY_OPTIONS,
+    )
+    if api_key:
+        return genai.Client(api_key=api_key, http_options=http_options)
+    return genai.Client(
+        vertexai=True,
+        project=project,
+        location=location,
+        http_options=http_options,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_genai_client(
+    api_key: Optional[str], project: Optional[str], location: Optional[str]
+) -> genai.Client:
+    """
+    Return a genai.Client shared by all providers with the same credentials.
+
+    Reusing the client keeps its HTTP connection pool (and established TLS
+    sessions) alive across providers and runs. Only use it synchronously;
+    async calls use a session-scoped client (see genai_session).
+    """
+    return _new_genai_client(api_key, project, location)
+
+
+# Pooled connections of the async httpx client are bound to the event loop
+# that opened them, so a process-wide async client breaks on the next
+# asyncio.run() ("Event loop is closed"). Async clients are therefore scoped
+# to a session (see genai_session) and closed when it ends. Maps
+# credentials -> AsyncClient for the sessions open in the current context.
+_SESSION_CLIENTS: ContextVar[Optional[dict]] = ContextVar("genai_session_clients", default=None)
+
+
+@asynccontextmanager
+async def genai_session(credentials: tuple) -> AsyncIterator[None]:
+    """
+    Share one async genai client for credentials across the async calls made
+    inside this block (including tasks it starts), closing it on exit.
+
+    Nested sessions for the same credentials reuse the outer client.
+    """
+    clients = _SESSION_CLIENTS.get() or {}
+    if credentials in clients:
+        yield
+        return
+    owned = _new_genai_client(*credentials)
+    # Copy rather than mutate, so tasks outside this block never see a
+    # client that is about to be closed
+    token = _SESSION_CLIENTS.set({**clients, credentials: owned.aio})
+    try:
+        yield
+    finally:
+        _SESSION_CLIENTS.reset(token)
+        await owned.aio.aclose()
+        owned.close()
+
+
+@asynccontextmanager
+async def _async_client(credentials: tuple) -> AsyncIterator[AsyncClient]:
+    """Yield the session's async client, or a one-off client closed on exit."""
+    client = (_SESSION_CLIENTS.get() or {}).get(credentials)
+    if client is not None:
+        yield client
+        return
+    owned = _new_genai_client(*credentials)
+    try:
+        yield owned.aio
+    finally:
+        await owned.aio.aclose()
+        owned.close()
+
+
+def _credentials_from_env(location: Optional[str] = None) -> tuple:
+    """Return the (api_key, project, location) genai credentials set in the environment."""
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    project = os.environ.get("GOOGLE_CLOUD_PROJECT")
+
+    if api_key:
+        return (api_key, None, None)
+    if project:
+        location = location or os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
+        return (None, project, location)
+    raise ValueError(
+        "Either GOOGLE_API_KEY or GOOGLE_CLOUD_PROJECT environment variable must be set"
+    )
+
+
+class GeminiEmbedder:
+    """
+    Text embeddings via the Gemini embedding API.
+
+    Uses the same credentials (and shared clients) as GoogleCloudProvider.
+    Recent embeddings are memoized, and concurrent requests for the same
+    text share one API call, so several cached models embedding the same
+    prompt cost a single embed_content request.
+    """
+
+    DEFAULT_MODEL = "text-embedding-004"
+    # Number of recent texts whose embeddings are kept
+    MEMO_SIZE = 32
+
+    def __init__(self, model_id: str = DEFAULT_MODEL, location: Optional[str] = None):
+        self.model_id = model_id
+        self._credentials = _credentials_from_env(location)
+        self._client = _get_genai_client(*self._credentials)
+        self._vectors: OrderedDict[str, list[float]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _remember(self, text: str, vector: list[float]) -> list[float]:
+        self._vectors[text] = vector
+        self._vectors.move_to_end(text)
+        if len(self._vectors) > self.MEMO_SIZE:
+            self._vectors.popitem(last=False)
+        return vector
+
+    def embed(self, text: str) -> list[float]:
+        vector = self._vectors.get(text)
+        if vector is not None:
+            return vector
+        result = self._client.models.embed_content(model=self.model_id, contents=text)
+        return self._remember(text, result.embeddings[0].values)
+
+    async def _aembed_uncached(self, text: str) -> list[float]:
+        try:
+            async with _async_client(self._credentials) as client:
+                result = await client.models.embed_content(model=self.model_id, contents=text)
+            return self._remember(text, result.embeddings[0].values)
+        finally:
+            self._inflight.pop(text, None)
+
+    def session(self) -> AsyncContextManager[None]:
+        return genai_session(self._credentials)
+
+    async def aembed(self, text: str) -> list[float]:
+        vector = self._vectors.get(text)
+        if vector is not None:
+            return vector
+        task = self._inflight.get(text)
+        if task is None:
+            task = asyncio.ensure_future(self._aembed_uncached(text))
+            self._inflight[text] = task
+        # Shielded so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(task)
+
+
 class GoogleCloudProvider(BaseProvider):
     """
     Google Gemini models via google-genai SDK.
@@ -28,32 +241,19 @@ class GoogleCloudProvider(BaseProvider):
         max_output_tokens (int): Max output tokens
     """
 
-    def __init__(self, model_id: str, config: Optional[dict] = None):
-        from google import genai
+    provider_name = "google_cloud"
 
+    def __init__(self, model_id: str, config: Optional[dict] = None):
         self.model_id = model_id
         self.config = config or {}
 
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        project = os.environ.get("GOOGLE_CLOUD_PROJECT")
-
-        if api_key:
-            self._client = genai.Client(api_key=api_key)
-        elif project:
-            location = self.config.get("location") or os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
-            self._client = genai.Client(
-                vertexai=True,
-                project=project,
-                location=location,
-            )
-        else:
-            raise ValueError(
-                "Either GOOGLE_API_KEY or GOOGLE_CLOUD_PROJECT environment variable must be set"
-            )
+        self._credentials = _credentials_from_env(self.config.get("location"))
+        self._client = _get_genai_client(*self._credentials)
 
-    def run(self, prompt: str) -> LLMResponse:
-        from google.genai import types
+        # Generation settings are static per provider, so build the config once
+        self._generate_config = self._build_config()
 
+    def _build_config(self) -> Optional[types.GenerateContentConfig]:
         enable_thinking = self.config.get("enable_thinking", False)
         thinking_budget = self.config.get("thinking_budget", 8192)
         response_format = self.config.get("response_format")
@@ -65,9 +265,7 @@ class GoogleCloudProvider(BaseProvider):
         if "max_output_tokens" in self.config:
             config_kwargs["max_output_tokens"] = self.config["max_output_tokens"]
         if enable_thinking:
-            config_kwargs["thinking_config"] = types.ThinkingConfig(
-                thinking_budget=thinking_budget
-            )
+            config_kwargs["thinking_config"] = _thinking_config(thinking_budget)
         if response_format == "json":
             config_kwargs["response_mime_type"] = "application/json"
             if response_schema:
@@ -75,52 +273,102 @@ class GoogleCloudProvider(BaseProvider):
                 full_schema.update(response_schema)
                 config_kwargs["response_schema"] = full_schema
 
-        generate_config = types.GenerateContentConfig(**config_kwargs) if config_kwargs else None
+        return types.GenerateContentConfig(**config_kwargs) if config_kwargs else None
 
+    def _to_response(
+        self,
+        prompt: str,
+        text: str,
+        usage,
+        latency_ms: float,
+        first_token_ms: Optional[float],
+    ) -> LLMResponse:
+        usage = usage or _EMPTY_USAGE
+        input_tokens = usage.prompt_token_count or 0
+        output_tokens = usage.candidates_token_count or 0
+        thinking_tokens = usage.thoughts_token_count
+
+        raw_usage = {
+            "prompt_token_count": input_tokens,
+            "candidates_token_count": output_tokens,
+            "thoughts_token_count": thinking_tokens,
+            "total_token_count": usage.total_token_count,
+        }
+
+        return LLMResponse(
+            model=self.model_id,
+            provider="google_cloud",
+            prompt=prompt,
+            response=text,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            thinking_tokens=thinking_tokens,
+            latency_ms=latency_ms,
+            raw_usage=raw_usage,
+            response_format=self.config.get("response_format"),
+            first_token_ms=first_token_ms,
+        )
+
+    def run(self, prompt: str) -> LLMResponse:
         try:
-            start = time.time()
-            response = self._client.models.generate_content(
+            start = time.perf_counter_ns()
+            first_token_ms: Optional[float] = None
+            text_parts = []
+            usage = None
+            for chunk in self._client.models.generate_content_stream(
                 model=self.model_id,
                 contents=prompt,
-                config=generate_config,
+                config=self._generate_config,
+            ):
+                text = chunk.text
+                if text:
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter_ns() - start) / 1_000_000
+                    text_parts.append(text)
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+            latency_ms = (time.perf_counter_ns() - start) / 1_000_000
+
+            return self._to_response(
+                prompt, "".join(text_parts), usage, latency_ms, first_token_ms
             )
-            latency_ms = (time.time() - start) * 1000
 
-            usage = response.usage_metadata
-            input_tokens = getattr(usage, "prompt_token_count", 0) or 0
-            output_tokens = getattr(usage, "candidates_token_count", 0) or 0
-            thinking_tokens = getattr(usage, "thoughts_token_count", None)
+        except _API_ERRORS as e:
+            return self.error_response(prompt, e)
 
-            raw_usage = {
-                "prompt_token_count": input_tokens,
-                "candidates_token_count": output_tokens,
-                "thoughts_token_count": thinking_tokens,
-                "total_token_count": getattr(usage, "total_token_count", None),
-            }
+    def session(self) -> AsyncContextManager[None]:
+        return genai_session(self._credentials)
 
-            return LLMResponse(
-                model=self.model_id,
-                provider="google_cloud",
-                prompt=prompt,
-                response=response.text,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                thinking_tokens=thinking_tokens,
-                latency_ms=latency_ms,
-                raw_usage=raw_usage,
-                response_format=response_format,
-            )
+    async def arun(self, prompt: str) -> LLMResponse:
+        """
+        Same as run(), but uses the SDK's native async client (client.aio).
 
-        except Exception as e:
-            return LLMResponse(
-                model=self.model_id,
-                provider="google_cloud",
-                prompt=prompt,
-                response="",
-                input_tokens=0,
-                output_tokens=0,
-                thinking_tokens=None,
-                latency_ms=0.0,
-                error=str(e),
-                response_format=response_format,
+        Run calls inside session() to share one connection pool between them;
+        outside a session each call opens and closes its own client.
+        """
+        try:
+            async with _async_client(self._credentials) as client:
+                start = time.perf_counter_ns()
+                first_token_ms: Optional[float] = None
+                text_parts = []
+                usage = None
+                async for chunk in await client.models.generate_content_stream(
+                    model=self.model_id,
+                    contents=prompt,
+                    config=self._generate_config,
+                ):
+                    text = chunk.text
+                    if text:
+                        if first_token_ms is None:
+                            first_token_ms = (time.perf_counter_ns() - start) / 1_000_000
+                        text_parts.append(text)
+                    if chunk.usage_metadata:
+                        usage = chunk.usage_metadata
+                latency_ms = (time.perf_counter_ns() - start) / 1_000_000
+
+            return self._to_response(
+                prompt, "".join(text_parts), usage, latency_ms, first_token_ms
             )
+
+        except _API_ERRORS as e:
+            return self.error_response(prompt, e)
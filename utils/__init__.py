@@ -1,3 +1,17 @@
-from .logger import save_log, print_summary
+from .logger import (
+    LogWriter,
+    save_log,
+    print_summary,
+    print_summary_header,
+    print_summary_row,
+    print_responses,
+)
 
-__all__ = ["save_log", "print_summary"]
+__all__ = [
+    "LogWriter",
+    "save_log",
+    "print_summary",
+    "print_summary_header",
+    "print_summary_row",
+    "print_responses",
+]
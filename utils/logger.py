@@ -1,46 +1,169 @@
-import json
 import os
 from datetime import datetime, timezone
+from operator import attrgetter
 from pathlib import Path
 from typing import List
 
+import orjson
+
 from providers.base import LLMResponse
 
 
 LOG_DIR = Path(__file__).parent.parent / "logs"
 
+# Log directories already created by this process. LOG_DIR can be
+# reassigned (--log-dir), so track each path rather than a single flag.
+_READY_DIRS: set[Path] = set()
+
+# Same layout as json.dump(..., indent=2, ensure_ascii=False)
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+# First characters a JSON document can start with
+_JSON_START_CHARS = frozenset('{["tfn-0123456789')
+# Objects and arrays must also end with the matching bracket
+_JSON_CLOSING = {"{": "}", "[": "]"}
+
 
 def _is_valid_json(text: str | None) -> bool:
     if not text:
         return False
+    # Reject ordinary prose on its first and last characters before
+    # attempting a parse
+    stripped = text.strip(" \t\n\r")
+    if not stripped or stripped[0] not in _JSON_START_CHARS:
+        return False
+    closing = _JSON_CLOSING.get(stripped[0])
+    if closing is not None and stripped[-1] != closing:
+        return False
     try:
-        json.loads(text)
+        orjson.loads(text)
         return True
-    except (json.JSONDecodeError, ValueError):
+    except orjson.JSONDecodeError:
         return False
 
 
-def _response_to_dict(resp: LLMResponse, run_id: str, timestamp: str) -> dict:
-    return {
+# Fetches every logged field in a single call
+_RESPONSE_FIELDS = attrgetter(
+    "provider",
+    "model",
+    "prompt",
+    "response",
+    "response_format",
+    "input_tokens",
+    "output_tokens",
+    "thinking_tokens",
+    "latency_ms",
+    "first_token_ms",
+    "error",
+    "raw_usage",
+)
+
+
+def _response_to_dict(
+    resp: LLMResponse, run_id: str, timestamp: str, run_prompt: str | None = None
+) -> dict:
+    """
+    Build one log entry.
+
+    The prompt is only included when it differs from run_prompt, the prompt
+    already recorded once at the top of the log.
+    """
+    (
+        provider,
+        model,
+        prompt,
+        text,
+        response_format,
+        input_tokens,
+        output_tokens,
+        thinking_tokens,
+        latency_ms,
+        first_token_ms,
+        error,
+        raw_usage,
+    ) = _RESPONSE_FIELDS(resp)
+    entry = {
         "run_id": run_id,
         "timestamp": timestamp,
-        "provider": resp.provider,
-        "model": resp.model,
-        "prompt": resp.prompt,
-        "response": resp.response,
-        "response_format": resp.response_format,
-        "valid_json": _is_valid_json(resp.response),
+        "provider": provider,
+        "model": model,
+        "response": text,
+        "response_format": response_format,
+        "valid_json": _is_valid_json(text),
         "tokens": {
-            "input": resp.input_tokens,
-            "output": resp.output_tokens,
-            "thinking": resp.thinking_tokens,
-            "total": (resp.input_tokens + resp.output_tokens)
-            + (resp.thinking_tokens or 0),
+            "input": input_tokens,
+            "output": output_tokens,
+            "thinking": thinking_tokens,
+            "total": input_tokens + output_tokens + (thinking_tokens or 0),
         },
-        "latency_ms": round(resp.latency_ms, 2),
-        "error": resp.error,
-        "raw_usage": resp.raw_usage,
+        "latency_ms": round(latency_ms, 2),
+        "first_token_ms": (
+            round(first_token_ms, 2) if first_token_ms is not None else None
+        ),
+        "error": error,
+        "raw_usage": raw_usage,
     }
+    if prompt != run_prompt:
+        entry["prompt"] = prompt
+    return entry
+
+
+def _ensure_log_dir() -> Path:
+    log_dir = LOG_DIR
+    if log_dir not in _READY_DIRS:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        _READY_DIRS.add(log_dir)
+    return log_dir
+
+
+class LogWriter:
+    """
+    Write a run's JSON log incrementally, one result at a time.
+
+    Produces the same layout as save_log(), but each result is written as
+    soon as it is available instead of after the whole run finishes.
+    Use as a context manager so the file is always closed as valid JSON.
+    """
+
+    def __init__(self, run_id: str, prompt: str):
+        log_dir = _ensure_log_dir()
+
+        self.run_id = run_id
+        self.prompt = prompt
+        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.path = log_dir / f"{run_id}.json"
+        self._count = 0
+        self._file = open(self.path, "wb")
+
+        header = orjson.dumps(
+            {"run_id": run_id, "timestamp": self.timestamp, "prompt": prompt},
+            option=_JSON_OPTIONS,
+        )
+        # Reopen the header object (drop the closing "\n}") to append results
+        self._file.write(header[:-2] + b',\n  "results": [')
+
+    def write(self, resp: LLMResponse) -> None:
+        entry = orjson.dumps(
+            _response_to_dict(resp, self.run_id, self.timestamp, self.prompt),
+            option=_JSON_OPTIONS,
+        )
+        # JSON strings never contain raw newlines, so this only re-indents
+        # the entry to sit inside the "results" array
+        self._file.write((b"," if self._count else b"") + b"\n    " + entry.replace(b"\n", b"\n    "))
+        self._count += 1
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.write(b"\n  ]\n}" if self._count else b"]\n}")
+        self._file.close()
+
+    def __enter__(self) -> "LogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 def save_log(responses: List[LLMResponse], run_id: str) -> Path:
@@ -48,51 +171,98 @@ def save_log(responses: List[LLMResponse], run_id: str) -> Path:
     Save all model responses for a single run to a JSON log file.
 
     File name format: logs/<run_id>.json
+
+    Entries are streamed to disk one at a time through LogWriter, so the
+    whole log is never held in memory at once.
     """
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now(timezone.utc).isoformat()
-    entries = [_response_to_dict(r, run_id, timestamp) for r in responses]
-
-    log_path = LOG_DIR / f"{run_id}.json"
-    with open(log_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "run_id": run_id,
-                "timestamp": timestamp,
-                "prompt": responses[0].prompt if responses else "",
-                "results": entries,
-            },
-            f,
-            ensure_ascii=False,
-            indent=2,
-        )
+    with LogWriter(run_id, responses[0].prompt if responses else "") as log:
+        for r in responses:
+            log.write(r)
+    return log.path
 
-    return log_path
 
+_SUMMARY_SEP = "-" * 99
+_SUMMARY_HEADER = "\n".join(
+    [
+        _SUMMARY_SEP,
+        f"{'Model':<45} {'In':>6} {'Out':>6} {'Think':>6} "
+        f"{'TTFT ms':>8} {'ms':>8}  Status",
+        _SUMMARY_SEP,
+    ]
+)
 
-def print_summary(responses: List[LLMResponse]) -> None:
-    """Print a formatted comparison table to stdout."""
-    sep = "-" * 90
-    print(sep)
-    print(
-        f"{'Model':<45} {'In':>6} {'Out':>6} {'Think':>6} {'ms':>8}  Status"
+_SUMMARY_FIELDS = attrgetter(
+    "model",
+    "input_tokens",
+    "output_tokens",
+    "thinking_tokens",
+    "first_token_ms",
+    "latency_ms",
+    "error",
+    "raw_usage",
+)
+
+# Status shown for responses served from the response cache (raw_usage["cache"])
+_CACHE_STATUS = {"exact": "CACHED", "semantic": "SEMANTIC"}
+
+
+def _format_summary_row(r: LLMResponse) -> str:
+    (
+        model,
+        input_tokens,
+        output_tokens,
+        thinking_tokens,
+        first_token_ms,
+        latency_ms,
+        error,
+        raw_usage,
+    ) = _SUMMARY_FIELDS(r)
+    thinking = str(thinking_tokens) if thinking_tokens is not None else "-"
+    cache_status = _CACHE_STATUS.get(raw_usage.get("cache"))
+    if cache_status:
+        # Stored timings belong to the original call, not this run
+        first_token = latency = "-"
+        status = cache_status
+    else:
+        first_token = f"{first_token_ms:.1f}" if first_token_ms is not None else "-"
+        latency = f"{latency_ms:.1f}"
+        status = "ERROR" if error else "OK"
+    return (
+        f"{model:<45} {input_tokens:>6} {output_tokens:>6} "
+        f"{thinking:>6} {first_token:>8} {latency:>8}  {status}"
     )
-    print(sep)
-    for r in responses:
-        thinking = str(r.thinking_tokens) if r.thinking_tokens is not None else "-"
-        status = "ERROR" if r.error else "OK"
-        print(
-            f"{r.model:<45} {r.input_tokens:>6} {r.output_tokens:>6} "
-            f"{thinking:>6} {r.latency_ms:>8.1f}  {status}"
-        )
-    print(sep)
 
-    print()
+
+def _format_responses(responses: List[LLMResponse]) -> str:
+    lines = [_SUMMARY_SEP, ""]
     for r in responses:
         if r.error:
-            print(f"[{r.model}] ERROR: {r.error}")
+            lines.append(f"[{r.model}] ERROR: {r.error}")
             continue
-        print(f"[{r.model}]")
-        print(r.response.strip())
-        print()
+        lines.append(f"[{r.model}]")
+        lines.append(r.response.strip())
+        lines.append("")
+    return "\n".join(lines)
+
+
+def print_summary_header() -> None:
+    """Print the header of the comparison table."""
+    print(_SUMMARY_HEADER)
+
+
+def print_summary_row(r: LLMResponse) -> None:
+    """Print one model's row of the comparison table."""
+    print(_format_summary_row(r), flush=True)
+
+
+def print_responses(responses: List[LLMResponse]) -> None:
+    """Close the comparison table and print each model's full response."""
+    print(_format_responses(responses))
+
+
+def print_summary(responses: List[LLMResponse]) -> None:
+    """Print a formatted comparison table to stdout."""
+    lines = [_SUMMARY_HEADER]
+    lines.extend(_format_summary_row(r) for r in responses)
+    lines.append(_format_responses(responses))
+    print("\n".join(lines))